@@ -2,10 +2,14 @@
 Start reading at solver.run. Simple GUI interface for solving Sudoku puzzles. Updating the GUI is done
 automatically with tk.IntVar objects.
 """
+import itertools
 import logging
 import math
+import multiprocessing
+import os
 import random
 import threading
+import time
 import tkinter as tk
 from tkinter import filedialog
 from tkinter import messagebox
@@ -21,9 +25,16 @@ Coords = tuple[int, int]
 StateChangeHandler = Callable[[Grid, Coords], Any]
 
 DEFAULT_GRID_WIDTH_CELLS = 9
+DEFAULT_BOX_WIDTH_CELLS = 3
+CELL_COUNT = DEFAULT_GRID_WIDTH_CELLS ** 2
 DEFAULT_CELL_WIDTH_PIXELS = 50
 GRID_WIDTH_PIXELS = DEFAULT_GRID_WIDTH_CELLS * DEFAULT_CELL_WIDTH_PIXELS
 EMPTY_CELL_VALUE = 0
+# puzzles still unsolved after this long are split up and solved in parallel. Spawning the worker pool alone takes
+# around 0.2-0.5s (every worker imports tkinter), so anything quicker to solve serially would only get slower
+SERIAL_SOLVE_SECONDS = 0.5
+PARALLEL_SPLIT_DEPTH = 3
+PARALLEL_CUBES_PER_PROCESS = 4
 DIGIT_FONT = ('Helvetica', '30')
 class Labels:
     STATE_ATTR = 'state'
@@ -31,6 +42,7 @@ class Labels:
     LOAD_BTN_TEXT = 'Load from file'
     STORE_BTN_TEXT = 'Save to file'
     START_BTN_TEXT = 'Start'
+    RANDOM_BTN_TEXT = 'Random'
     RESET_BTN_TEXT = 'Reset'
     CLEAR_BTN_TEXT = 'Clear'
     GRID_CANVAS_NAME = 'grid_canvas'
@@ -43,92 +55,337 @@ highlighted_cell: Coords = None
 
 digits = set(range(1, DEFAULT_GRID_WIDTH_CELLS + 1))
 digits_with_zero = set(range(DEFAULT_GRID_WIDTH_CELLS + 1))
-
-""" BEGIN: PEERS"""
-def get_bound_box(coords: Coords, grid_size: int) -> tuple[int, int, int]:
-    y, x = coords
-    box_width = int(math.sqrt(grid_size))
-    return y - (y % box_width), x - (x % box_width), box_width
-
-
-def get_peers(grid: Grid, coords: Coords) -> set[int]:
-    y0, x0 = coords
-    # row
-    s = {cell.get() for x, cell in enumerate(grid[y0]) if x != x0}
-    # col
-    s |= {row[x0].get() for y, row in enumerate(grid) if y != y0}
-    # box
-    top, left, box_size = get_bound_box((y0, x0), len(grid))
-    for y in range(top, top + box_size):
-        for x in range(left, left + box_size):
-            if y != y0 and x != x0:
-                s.add(grid[y][x].get())
-    return s
-""" END """
-
-""" BEGIN: DIVISIONS """
-def cols(grid: Grid) -> Grid:
-    # transposes the grid
-    return list(map(list, zip(*grid)))
-
-
-def boxes(grid: Grid) -> Grid:
-    grid_width_boxes = box_width_cells = int(math.sqrt(len(grid)))
-    # (y, x) is the top-left corner of a box
-    box_list = []
-    for y0 in range(0, len(grid), grid_width_boxes):
-        for x0 in range(0, len(grid), grid_width_boxes):
-            box = []
-            for y in range(y0, y0 + box_width_cells):
-                box.extend(grid[y][x0:x0+box_width_cells])
-            box_list.append(box)
-    return box_list
-""" END """
+# bit (d - 1) set means digit d; a full mask means every digit
+ALL_DIGITS_MASK = (1 << DEFAULT_GRID_WIDTH_CELLS) - 1
 
 """ BEGIN: SOLVE """
-def solve(
-        grid: Grid,
-        y0: int = 0,
-        x0: int = 0,
-) -> bool:
-    # starts iterating at cell from recursion level
-    for y in range(y0, len(grid)):
-        for x in range(x0 if y == y0 else 0, len(grid[y])):
-            # finds the cell for this recursion level
-            if grid[y][x].get() == EMPTY_CELL_VALUE:
-                peer_set = get_peers(grid, (y, x))
-                for digit in range(1, len(grid) + 1):
-                    if digit not in peer_set:
-                        grid[y][x].set(digit)
-                        if solve(grid, y0=y, x0=x):
-                            # if this and all subsequent cells have a valid digit (i.e. the grid has been solved)
-                            return True
-                # no solution, backtrack
-                grid[y][x].set(EMPTY_CELL_VALUE)
+def flatten_grid(grid: RawGrid) -> bytearray:
+    return bytearray(value for row in grid for value in row)
+
+
+CELL_INDICES = tuple(range(CELL_COUNT))
+# row, column and box number of each cell of a flat board
+ROW_OF = tuple(i // DEFAULT_GRID_WIDTH_CELLS for i in range(CELL_COUNT))
+COL_OF = tuple(i % DEFAULT_GRID_WIDTH_CELLS for i in range(CELL_COUNT))
+BOX_OF = tuple((y // DEFAULT_BOX_WIDTH_CELLS) * DEFAULT_BOX_WIDTH_CELLS + x // DEFAULT_BOX_WIDTH_CELLS
+               for y, x in zip(ROW_OF, COL_OF))
+# flat indices of the cells in each row, column and box
+ROWS = tuple(tuple(i for i in range(CELL_COUNT) if ROW_OF[i] == n) for n in range(DEFAULT_GRID_WIDTH_CELLS))
+COLS = tuple(tuple(i for i in range(CELL_COUNT) if COL_OF[i] == n) for n in range(DEFAULT_GRID_WIDTH_CELLS))
+BOXES = tuple(tuple(i for i in range(CELL_COUNT) if BOX_OF[i] == n) for n in range(DEFAULT_GRID_WIDTH_CELLS))
+UNITS = ROWS + COLS + BOXES
+# the 20 cells sharing a row, column or box with each cell
+PEERS = tuple(tuple(sorted(set().union(ROWS[ROW_OF[i]], COLS[COL_OF[i]], BOXES[BOX_OF[i]]) - {i}))
+              for i in range(CELL_COUNT))
+
+
+def is_solved(board: bytearray) -> bool:
+    """
+    Determines if a given board is solved.
+    :param board: The flat board to check, indexed as y * 9 + x
+    :return: True if the board is solved, False otherwise
+    """
+    for unit in UNITS:
+        digits_mask = 0
+        for i in unit:
+            if (value := board[i]) == EMPTY_CELL_VALUE:
                 return False
-    # no more empty cells
+            digits_mask |= 1 << (value - 1)
+        if digits_mask != ALL_DIGITS_MASK:
+            return False
+    return True
+
+
+def is_valid_puzzle(board: bytearray) -> bool:
+    for unit in UNITS:
+        digits_mask = 0
+        for i in unit:
+            if (value := board[i]) != EMPTY_CELL_VALUE:
+                bit = 1 << (value - 1)
+                if digits_mask & bit:
+                    # the digit is already in the unit
+                    return False
+                digits_mask |= bit
     return True
 
 
-def is_solved(grid: Grid) -> bool:
+class FastBoard:
     """
-    Determines if a given grid is solved.
-    :param grid: The grid to check
-    :return: True if the grid is solved, False otherwise
+    Solver state of a flat 9x9 board: the digits and the candidate mask of each cell. Placing a digit clears it from
+    the candidates of the cell's empty peers, so the mask of an empty cell only holds digits none of its peers use.
     """
-    all_digits = {i for i in range(1, len(grid) + 1)}
-    for group in grid + cols(grid) + boxes(grid):
-        unique_digits_in_group = {cell.get() for cell in group}
-        if unique_digits_in_group != all_digits:
+    __slots__ = ('cells', 'cand')
+
+    def __init__(self, cells: bytearray):
+        """
+        :param cells: The flat board, indexed as y * 9 + x. It is shared, not copied, so solving fills it in place.
+        """
+        self.cells = cells
+        # a plain list rather than array('H'): reading an array item allocates a new int, which makes the search
+        # noticeably slower
+        self.cand = cand = [ALL_DIGITS_MASK] * CELL_COUNT
+        # digits used by each row, column and box, only needed to work out the starting candidates
+        row, col, box = [0] * DEFAULT_GRID_WIDTH_CELLS, [0] * DEFAULT_GRID_WIDTH_CELLS, [0] * DEFAULT_GRID_WIDTH_CELLS
+        for i, value in enumerate(cells):
+            if value != EMPTY_CELL_VALUE:
+                bit = 1 << (value - 1)
+                row[ROW_OF[i]] |= bit
+                col[COL_OF[i]] |= bit
+                box[BOX_OF[i]] |= bit
+        for i, value in enumerate(cells):
+            if value == EMPTY_CELL_VALUE:
+                cand[i] = ~(row[ROW_OF[i]] | col[COL_OF[i]] | box[BOX_OF[i]]) & ALL_DIGITS_MASK
+
+
+def _assign(board: FastBoard, trail: list[tuple[int, int]], placed: list[int], i: int, bit: int) -> bool:
+    """
+    Places a digit and propagates it: the digit is removed from the candidates of every empty peer, and peers left
+    with a single candidate are placed in turn. Every change is logged so that _undo can rewind it.
+    :return: False if some cell ran out of candidates, True otherwise
+    """
+    # globals and attributes bound to locals, the loops below run for every node of the search
+    peers, empty, cells, cand = PEERS, EMPTY_CELL_VALUE, board.cells, board.cand
+    pending = [(i, bit)]
+    while pending:
+        i, bit = pending.pop()
+        # a peer placed earlier in this pass may have taken the digit
+        if not cand[i] & bit:
             return False
+        cells[i] = bit.bit_length()
+        placed.append(i)
+        for peer in peers[i]:
+            peer_cand = cand[peer]
+            if peer_cand & bit and cells[peer] == empty:
+                trail.append((peer, peer_cand))
+                peer_cand ^= bit
+                cand[peer] = peer_cand
+                if not peer_cand:
+                    return False
+                if not peer_cand & (peer_cand - 1):
+                    # naked single
+                    pending.append((peer, peer_cand))
     return True
 
-def is_valid_puzzle(grid: Grid) -> bool:
-    for group in grid + cols(grid) + boxes(grid):
-        digits_in_group = [cell.get() for cell in group if cell.get() != EMPTY_CELL_VALUE]
-        if len(digits_in_group) != len(set(digits_in_group)):
+
+def _undo(board: FastBoard, trail: list[tuple[int, int]], placed: list[int], trail_mark: int, placed_mark: int) -> None:
+    cells, cand, empty = board.cells, board.cand, EMPTY_CELL_VALUE
+    while len(placed) > placed_mark:
+        cells[placed.pop()] = empty
+    while len(trail) > trail_mark:
+        peer, peer_cand = trail.pop()
+        cand[peer] = peer_cand
+
+
+def _most_constrained(board: FastBoard, order: tuple[int, ...]) -> tuple[int, int]:
+    """
+    Picks the empty cell with the fewest candidates (MRV).
+    :param order: The order the cells are scanned in, ties go to the cell scanned first
+    :return: The index and candidates of the cell, or (-1, -1) if the board is full
+    """
+    cells, cand, empty = board.cells, board.cand, EMPTY_CELL_VALUE
+    best_i = best_cand = -1
+    best_count = DEFAULT_GRID_WIDTH_CELLS + 1
+    for i in order:
+        if cells[i] == empty:
+            count = cand[i].bit_count()
+            if count < best_count:
+                best_i, best_cand, best_count = i, cand[i], count
+                # a dead end fails fast and a naked single is forced, no need to look further
+                if count <= 1:
+                    break
+    return best_i, best_cand
+
+
+def _solve_fast(
+        board: FastBoard,
+        trail: list[tuple[int, int]],
+        placed: list[int],
+        deadline: float = math.inf,
+        order: tuple[int, ...] = CELL_INDICES,
+) -> bool:
+    # depth-first search on an explicit stack of (cell, untried candidates, trail mark, placed mark) frames;
+    # the frame being worked on is kept in locals
+    i, remaining = _most_constrained(board, order)
+    if i == -1:
+        # no more empty cells
+        return True
+    trail_mark, placed_mark = len(trail), len(placed)
+    stack = []
+    while True:
+        if remaining:
+            if time.perf_counter() > deadline:
+                raise TimeoutError()
+            # pops the lowest candidate digit
+            bit = remaining & -remaining
+            remaining ^= bit
+            if _assign(board, trail, placed, i, bit):
+                next_i, next_remaining = _most_constrained(board, order)
+                if next_i == -1:
+                    return True
+                stack.append((i, remaining, trail_mark, placed_mark))
+                i, remaining = next_i, next_remaining
+                trail_mark, placed_mark = len(trail), len(placed)
+            else:
+                _undo(board, trail, placed, trail_mark, placed_mark)
+        elif stack:
+            # no digit fits this cell, backtrack and take back the parent's digit
+            i, remaining, trail_mark, placed_mark = stack.pop()
+            _undo(board, trail, placed, trail_mark, placed_mark)
+        else:
             return False
-    return True
+
+
+def _split(board: FastBoard, trail: list[tuple[int, int]], placed: list[int], depth: int, cubes: list[bytes]) -> bool:
+    """
+    Expands the search tree to the given depth, collecting a snapshot of the board at every live leaf (cube-and-conquer).
+    Only branch points count toward the depth, forced cells are filled in without using up a level. The candidate
+    masks of a snapshot follow from its digits, so the cells alone describe the sub-problem.
+    :return: True if the board got solved during the expansion, False otherwise
+    """
+    if depth == 0:
+        cubes.append(bytes(board.cells))
+        return False
+    best_i, remaining = _most_constrained(board, CELL_INDICES)
+    if best_i == -1:
+        return True
+    child_depth = depth - 1 if remaining.bit_count() >= 2 else depth
+    while remaining:
+        bit = remaining & -remaining
+        remaining ^= bit
+        trail_mark, placed_mark = len(trail), len(placed)
+        if _assign(board, trail, placed, best_i, bit) and _split(board, trail, placed, child_depth, cubes):
+            return True
+        _undo(board, trail, placed, trail_mark, placed_mark)
+    return False
+
+
+def _random_clues(rng: random.Random, clue_count: int) -> bytearray | None:
+    board = FastBoard(bytearray(CELL_COUNT))
+    trail, placed = [], []
+    clues = bytearray(CELL_COUNT)
+    drawn_count = 0
+    for i in rng.sample(range(CELL_COUNT), CELL_COUNT):
+        # propagation fills cells too, those count toward the clues
+        if len(placed) >= clue_count:
+            break
+        if board.cells[i] != EMPTY_CELL_VALUE:
+            continue
+        bits = [bit for bit in (1 << n for n in range(DEFAULT_GRID_WIDTH_CELLS)) if board.cand[i] & bit]
+        rng.shuffle(bits)
+        for bit in bits:
+            trail_mark, placed_mark = len(trail), len(placed)
+            if _assign(board, trail, placed, i, bit):
+                clues[i] = bit.bit_length()
+                drawn_count += 1
+                break
+            _undo(board, trail, placed, trail_mark, placed_mark)
+    if len(placed) < clue_count:
+        # every cell left ran out of digits
+        return None
+    # the cells filled by propagation follow from the drawn clues, so any of them can make up the count without
+    # changing the puzzle's solutions
+    forced = [i for i in placed if not clues[i]]
+    for i in forced[:clue_count - drawn_count]:
+        clues[i] = board.cells[i]
+    return clues
+
+
+def random_grid(clue_count: int = 20, seed: int | None = None) -> RawGrid:
+    """
+    Generates a random solvable 9x9 puzzle. Each clue is drawn from the candidates its cell has left and is propagated
+    like a solver move, so no clue leaves another cell without candidates. Clue sets that still have no solution are
+    thrown away and drawn again.
+    :param clue_count: The number of digits to place, from 0 to 81
+    :param seed: Seed for the random choices, for reproducible puzzles
+    :return: The puzzle
+    """
+    if not 0 <= clue_count <= CELL_COUNT:
+        raise ValueError(f'Expected a clue count between 0 and {CELL_COUNT} but found {clue_count}')
+    rng = random.Random(seed)
+    while True:
+        clues = _random_clues(rng, clue_count)
+        # solves a copy, the clues themselves are the puzzle
+        if clues is not None and _solve_fast(FastBoard(bytearray(clues)), [], []):
+            return split_list(list(clues), DEFAULT_GRID_WIDTH_CELLS)
+
+
+def _solve_with_seed(task: tuple[bytes, int]) -> bytes | None:
+    """
+    Solves a board with a cell scan order and digit order shuffled by the given seed. Seed 0 keeps the plain order.
+    Runs in a worker process.
+    :param task: The flat board and the seed
+    :return: The solved board, or None if it has no solution
+    """
+    cells, seed = task
+    order = list(CELL_INDICES)
+    labels = list(range(DEFAULT_GRID_WIDTH_CELLS + 1))
+    if seed:
+        rng = random.Random(seed)
+        rng.shuffle(order)
+        # relabelling the digits changes the order they're tried in without touching the search itself
+        labels[1:] = rng.sample(labels[1:], DEFAULT_GRID_WIDTH_CELLS)
+    board = bytearray(labels[value] for value in cells)
+    if not _solve_fast(FastBoard(board), [], [], order=tuple(order)):
+        return None
+    digit_of = {label: digit for digit, label in enumerate(labels)}
+    return bytes(digit_of[value] for value in board)
+
+
+def solve_parallel(board: bytearray, processes: int) -> bool:
+    """
+    Solves a flat 9x9 board in place by splitting the search tree into independent sub-problems and handing them out
+    to a pool of processes. Each sub-problem is searched in its own random order, since an unlucky order can take
+    far longer than a lucky one on the same puzzle. The first solution found wins and the remaining workers are
+    stopped.
+    :param board: The flat board, indexed as y * 9 + x
+    :param processes: The number of worker processes
+    :return: True if the board was solved, False if it has no solution
+    """
+    depth = PARALLEL_SPLIT_DEPTH
+    while True:
+        cubes = []
+        if _split(FastBoard(board), [], [], depth, cubes):
+            return True
+        if not cubes:
+            # every branch died during the expansion
+            return False
+        # each worker should get several sub-problems, so the split goes deeper until there are enough
+        if len(cubes) >= PARALLEL_CUBES_PER_PROCESS * processes:
+            break
+        depth += 1
+    # every worker gets a task even with few sub-problems: they are handed out round-robin, each time with a fresh
+    # seed, so copies of one sub-problem race in different orders. A None result only rules out that sub-problem
+    task_count = max(len(cubes), processes)
+    tasks = [(cube, seed) for seed, cube in enumerate(itertools.islice(itertools.cycle(cubes), task_count))]
+    # workers are spawned rather than forked on every platform: this runs on a background thread next to Tk's main
+    # loop, and forking a multithreaded process that holds Tcl state can deadlock them.
+    # leaving the with block terminates the workers still searching
+    with multiprocessing.get_context('spawn').Pool(processes) as pool:
+        for solution in pool.imap_unordered(_solve_with_seed, tasks):
+            if solution is not None:
+                board[:] = solution
+                return True
+    return False
+
+
+def solve_raw(board: bytearray) -> bool:
+    """
+    Solves a flat 9x9 board in place. Hard puzzles are handed to solve_parallel when there are several CPUs, since
+    starting the workers costs more than an easy puzzle takes to solve.
+    :param board: The flat board, indexed as y * 9 + x
+    :return: True if the board was solved, False if it has no solution
+    """
+    if len(board) != CELL_COUNT:
+        raise ValueError(f'Expected a flat 9x9 board of {CELL_COUNT} cells but found {len(board)}')
+    processes = os.cpu_count() or 1
+    deadline = time.perf_counter() + SERIAL_SOLVE_SECONDS if processes > 1 else math.inf
+    initial_board = bytes(board)
+    try:
+        return _solve_fast(FastBoard(board), [], [], deadline)
+    except TimeoutError:
+        logging.debug(f'Still searching after {SERIAL_SOLVE_SECONDS}s, switching to {processes} processes')
+        board[:] = initial_board
+        return solve_parallel(board, processes)
 """ END """
 
 """ BEGIN: UTIL """
@@ -138,16 +395,14 @@ def read_grid(filename: str) -> RawGrid:
     # first character in file specifies the grid width
     width = int(content[0])
     valid_digits = {str(i) for i in range(width + 1)}
-    flattened_grid = []
-    for c in content[1:]:
-        if not c.isspace():
-            if c in valid_digits:
-                flattened_grid.append(c)
-            else:
-                raise IOError(f'Invalid character {c=} in file.')
-    if (cell_count := len(flattened_grid)) != (expected := width ** 2):
+    # str.split() drops the same (Unicode) whitespace as str.isspace()
+    body = ''.join(content[1:].split())
+    if invalid_chars := set(body) - valid_digits:
+        c = min(invalid_chars, key=body.index)
+        raise IOError(f'Invalid character {c=} in file.')
+    if (cell_count := len(body)) != (expected := width ** 2):
         raise ValueError(f'Expected grid of width {width} to have {expected} cells but found {cell_count}')
-    return split_list(flattened_grid, width)
+    return [list(map(int, body[i:i + width])) for i in range(0, cell_count, width)]
 
 
 def write_grid(grid: RawGrid, filename: str) -> None:
@@ -176,9 +431,9 @@ def get_cell_text_tag(cell_x: int, cell_y: int) -> str:
 def get_cell_rect_tag(cell_x: int, cell_y: int) -> str:
     return f'cell_rect({cell_x},{cell_y})'
 
-def center_of_cell(cell_x: int, cell_y: int) -> tuple[float, float]:
-    return (cell_x * DEFAULT_CELL_WIDTH_PIXELS + DEFAULT_CELL_WIDTH_PIXELS / 2,
-            cell_y * DEFAULT_CELL_WIDTH_PIXELS + DEFAULT_CELL_WIDTH_PIXELS / 2)
+# pixel offset of the center of each cell, the same along both axes
+CELL_CENTERS_PIXELS = tuple(cell * DEFAULT_CELL_WIDTH_PIXELS + DEFAULT_CELL_WIDTH_PIXELS / 2
+                            for cell in range(DEFAULT_GRID_WIDTH_CELLS))
 
 def render_cell(canvas: tk.Canvas, cell: tk.IntVar, cell_x: int, cell_y: int) -> None:
     cell_text_tag = get_cell_text_tag(cell_x, cell_y)
@@ -187,11 +442,15 @@ def render_cell(canvas: tk.Canvas, cell: tk.IntVar, cell_x: int, cell_y: int) ->
     else:
         canvas.itemconfigure(cell_text_tag, text=str(cell.get()))
 
+# width of each grid line, box borders are thicker and the top and left lines must be thicker still because
+# they're cut off
+GRID_LINE_WIDTHS = tuple((9 if line_number == 0 else 3) if line_number % DEFAULT_BOX_WIDTH_CELLS == 0 else 1
+                         for line_number in range(DEFAULT_GRID_WIDTH_CELLS + 1))
+
 def render_grid_lines(canvas: tk.Canvas, grid_width_cells: int):
     for line_number in range(0, grid_width_cells + 1):
         coord = line_number * DEFAULT_CELL_WIDTH_PIXELS
-        # top and left lines must be thicker because they're cut off
-        line_width = (9 if line_number == 0 else 3) if line_number % 3 == 0 else 1
+        line_width = GRID_LINE_WIDTHS[line_number]
         for coords in ((coord, 0, coord, GRID_WIDTH_PIXELS), (0, coord, GRID_WIDTH_PIXELS, coord)):
             canvas.create_line(coords, fill=Labels.BLACK_COLOR, width=line_width)
 
@@ -209,6 +468,14 @@ def create_empty_grid(canvas: tk.Canvas, width: int) -> Grid:
 def dump_grid_values(grid: Grid) -> RawGrid:
     return [[cell.get() for cell in row] for row in grid]
 
+def set_grid_values(grid: Grid, board: bytearray) -> None:
+    # every write fires the cell's render trace, so only cells that actually changed are written
+    width = len(grid)
+    for i, value in enumerate(board):
+        cell = grid[i // width][i % width]
+        if cell.get() != value:
+            cell.set(value)
+
 def cell_at(pixel_x: int, pixel_y: int) -> Coords:
     return (pixel_x // DEFAULT_CELL_WIDTH_PIXELS, pixel_y // DEFAULT_CELL_WIDTH_PIXELS)
 
@@ -242,10 +509,9 @@ def create_cell_rects(canvas, grid_width_cells: int):
 def create_cell_texts(canvas, grid_width_cells: int):
     for cell_x in range(grid_width_cells):
         for cell_y in range(grid_width_cells):
-            center_pixel_x, center_pixel_y = center_of_cell(cell_x, cell_y)
             canvas.create_text(
-                center_pixel_x,
-                center_pixel_y,
+                CELL_CENTERS_PIXELS[cell_x],
+                CELL_CENTERS_PIXELS[cell_y],
                 text=' ',
                 font=DIGIT_FONT,
                 tags=get_cell_text_tag(cell_x, cell_y)
@@ -264,30 +530,59 @@ def run() -> None:
     raw_grid = dump_grid_values(grid)
     render_grid_lines(canvas, DEFAULT_GRID_WIDTH_CELLS)
 
-    def load():
-        filename = filedialog.askopenfilename(filetypes=(('text files', '*.txt'),))
-        new_raw_grid = read_grid(filename)
+    def set_buttons_state(state: str):
+        for button in (load_button, store_button, random_button, start_button, reset_button, clear_button):
+            button[Labels.STATE_ATTR] = state
+
+    def show_new_grid(new_raw_grid: RawGrid):
         for y, row in enumerate(grid):
             raw_grid[y][:] = new_raw_grid[y]
             for x, cell in enumerate(row):
                 cell.set(new_raw_grid[y][x])
 
+    def load():
+        filename = filedialog.askopenfilename(filetypes=(('text files', '*.txt'),))
+        show_new_grid(read_grid(filename))
+
+    def generate():
+        set_buttons_state(tk.DISABLED)
+        threading.Thread(target=generate_in_background).start()
+
+    def generate_in_background():
+        # checking that a puzzle is solvable runs the solver, which can take a while, so it stays off the Tk thread
+        canvas.after(0, finish_generate, random_grid())
+
+    def finish_generate(new_raw_grid: RawGrid):
+        show_new_grid(new_raw_grid)
+        set_buttons_state(tk.NORMAL)
+
     def store():
         filename = filedialog.asksaveasfilename(filetypes=(('text files', '*.txt'),))
         grid_values = dump_grid_values(grid)
         write_grid(grid_values, filename)
 
     def start():
-        for button in (load_button, store_button, start_button, reset_button, clear_button):
-            button[Labels.STATE_ATTR] = tk.DISABLED
-        if not is_valid_puzzle(grid):
-            messagebox.showerror('', 'This puzzle is not solvable (invalid initial conditions).')
+        set_buttons_state(tk.DISABLED)
+        # solves on a snapshot so the GUI only redraws the final values
+        board = flatten_grid(dump_grid_values(grid))
+        if not is_valid_puzzle(board):
+            finish_solve(None, 'This puzzle is not solvable (invalid initial conditions).')
+        else:
+            threading.Thread(target=solve_in_background, args=(board,)).start()
+
+    def solve_in_background(board: bytearray):
+        # the worker thread never touches the grid, the result is handed back to the Tk thread in one batch
+        if solve_raw(board):
+            canvas.after(0, finish_solve, board, None)
+        else:
+            canvas.after(0, finish_solve, None, 'This puzzle is not solvable.')
+
+    def finish_solve(board: bytearray | None, error: str | None):
+        if board is not None:
+            set_grid_values(grid, board)
         else:
-            solved = solve(grid)
-            if not solved:
-                messagebox.showerror('', 'This puzzle is not solvable.')
-        for button in (load_button, store_button, start_button, reset_button, clear_button):
-            button[Labels.STATE_ATTR] = tk.NORMAL
+            messagebox.showerror('', error)
+        set_buttons_state(tk.NORMAL)
 
     def reset():
         for y, row in enumerate(grid):
@@ -347,12 +642,13 @@ def run() -> None:
 
     load_button = ttk.Button(right_frame, text=Labels.LOAD_BTN_TEXT, command=load)
     store_button = ttk.Button(right_frame, text=Labels.STORE_BTN_TEXT, command=store)
-    start_button = ttk.Button(right_frame, text=Labels.START_BTN_TEXT, command=lambda: threading.Thread(target=start).start())
+    random_button = ttk.Button(right_frame, text=Labels.RANDOM_BTN_TEXT, command=generate)
+    start_button = ttk.Button(right_frame, text=Labels.START_BTN_TEXT, command=start)
     reset_button = ttk.Button(right_frame, text=Labels.RESET_BTN_TEXT, command=reset)
     clear_button = ttk.Button(right_frame, text=Labels.CLEAR_BTN_TEXT, command=clear)
 
 
-    for i, button in enumerate((load_button, store_button, start_button, reset_button, clear_button)):
+    for i, button in enumerate((load_button, store_button, random_button, start_button, reset_button, clear_button)):
         button.grid(row=i, column=0, pady=(10 if i == 0 else 0, 10), padx=(7, 10))
 
     canvas.grid(row=0, column=0)
@@ -365,4 +661,6 @@ def run() -> None:
 """ END """
 
 if __name__ == '__main__':
+    # lets the solver's worker processes start from a frozen executable
+    multiprocessing.freeze_support()
     run()